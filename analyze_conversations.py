@@ -0,0 +1,323 @@
+"""
+This script parses all saved conversation transcripts into structured turn records (one record per customer answer),
+and computes funnel and retry statistics per asked field, both in total and per day. It is meant to show where the
+customers struggle: which fields trigger repeated prompts, how often brand suggestions are accepted, and where people
+quit.
+
+Transcripts are parsed in a process pool, and the per-file results are cached by file modification time, so re-running
+the script on a growing archive only parses the new (or changed) files. The cache is split into one json file per data
+sub-folder (i.e. per date and shard, see `truck_bot.allocate_paths()`), and only the files of sub-folders with new,
+changed, or deleted transcripts are rewritten.
+"""
+
+import os
+import re
+import glob
+import json
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from truck_fields import TRUCK_FIELDS, is_batch_row
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                 HELPER FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+
+# Prompts which can be unambiguously assigned to a field: prompt -> (field, whether the prompt is a retry)
+PROMPTS = {
+    'Please tell me your name: ': ('Name', False),
+    'What is the designation of this fleet? ': ('Fleet ID', False),
+    'How many vehicles are there in this fleet? ': ('Vehicle count', False),
+    'What is the number of truck that contains incorrect information? ': ('Truck to correct', False),
+    'Which fleet row contains incorrect information? ': ('Truck to correct', False),  # wording of older transcripts
+}
+for field_name, field_msg, _, field_err_msg, _ in TRUCK_FIELDS:
+    PROMPTS[field_msg] = (field_name, False)
+    PROMPTS[field_err_msg] = (field_name, True)
+
+# Error messages of older transcripts, from before units were accepted
+PROMPTS.update({
+    'Engine size should contain only numbers; please try again: ': ('Engine (cc)', True),
+    'Truck weight should contain only whole or decimal numbers; please try again: ': ('Weight (T)', True),
+    'Maximal load should contain only whole or decimal numbers; please try again: ': ('Max load (T)', True),
+})
+
+# Prompts that repeat the previous question, regardless of which field it was
+RETRY_PROMPTS = ['Please provide whole numbers only: ', 'Please choose one of the following: ']
+
+# Bot messages which determine what the generic '> ' prompt is about
+SECTIONS = {
+    'Please check if the following information is correct': 'Truck confirmation',
+    'Fleet information collected.': 'Fleet confirmation',
+}
+
+
+def classify_prompt(question: str, section: str, previous_field: str) -> Tuple[str, bool]:
+    """
+    Determines which field the bot was asking for, and whether it was asking for it again.
+
+    Input
+    :param question: prompt that the customer answered
+    :param section: current part of the conversation, used for the generic '> ' prompt
+    :param previous_field: field of the previous customer answer
+
+    Output
+    :return: name of the field, whether the prompt is a retry
+    """
+    if question in PROMPTS:
+        return PROMPTS[question]
+    if any([question.startswith(x) for x in RETRY_PROMPTS]):
+        return previous_field, True
+    if question == '> ':
+        return section, False
+    if question.startswith('You wrote '):
+        return 'Brand suggestion', False
+    if 'doesn\'t match any known truck brand' in question:
+        return 'Brand unknown', False
+
+    # Cells re-prompted after a multi-row paste, e.g. "Vehicle nr. 3, Engine size should contain only numbers; ..."
+    batch_cell = re.match(r'Vehicle nr\. \d+, (.*)$', question, flags=re.DOTALL)
+    if batch_cell and batch_cell.group(1) in PROMPTS:
+        return PROMPTS[batch_cell.group(1)][0], True
+    if re.match(r'Vehicle nr\. \d+ (has \d+ values|can be read in several ways)', question):
+        return 'Batch row', True
+
+    return 'Other', False
+
+
+def parse_conversation(path: str) -> List[Dict]:
+    """
+    Parses a single conversation transcript into turn records, one per customer answer.
+
+    Input
+    :param path: path to the conversation txt file
+
+    Output
+    :return: list of turn records
+    """
+    file_name = os.path.basename(path)
+    date = file_name.split('_-_')[0]
+
+    records = []
+    pending = None  # bot message which has not been answered (yet)
+    section = 'Other'
+    with open(path, encoding='utf-8') as conv_file:
+        for line in conv_file:
+            line = line.rstrip('\n')
+
+            if line.startswith('Bot: '):
+                # The previous bot message was not a question, so check if it announces a new section
+                if pending is not None:
+                    section = next((v for k, v in SECTIONS.items() if pending.strip().startswith(k)), section)
+                pending = line[len('Bot: '):]
+
+            elif line.startswith('Customer: '):
+                answer = line[len('Customer: '):]
+                previous_field = records[-1]['field'] if records else 'Other'
+                field, retry = classify_prompt(pending or '', section, previous_field)
+                if field == 'Brand' and is_batch_row(answer):
+                    field, section = 'Batch row', 'Batch row'
+                records.append({'file': file_name,
+                                'date': date,
+                                'turn': len(records) + 1,
+                                'field': field,
+                                'retry': retry,
+                                'answer': answer,
+                                'quit': answer.lower() in ['q', 'quit']})
+                pending = None
+
+            elif pending is not None:  # continuation of a multi-line bot message
+                pending = '\n'.join([pending, line])
+
+    return records
+
+
+def shard_cache_path(cache_folder: str, shard: str) -> str:
+    """
+    Constructs the path of the json cache file for the transcripts of one data sub-folder, e.g. `2020-03-03/a7` is
+    cached in `2020-03-03_a7.json`, and the transcripts directly in the data folder in `_.json`.
+
+    Input
+    :param cache_folder: path to the folder holding the cache files
+    :param shard: path of the sub-folder relative to the data folder, with '/' as separator
+
+    Output
+    :return: path to the json cache file
+    """
+    return os.path.join(cache_folder, (shard.replace('/', '_') or '_') + '.json')
+
+
+def load_cache(cache_path: str) -> Dict:
+    """
+    Loads the cache of already parsed transcripts of one data sub-folder, if it exists.
+
+    Input
+    :param cache_path: path to the json cache file
+
+    Output
+    :return: dictionary mapping transcript paths to their modification times and turn records
+    """
+    if not os.path.isfile(cache_path):
+        return {}
+    with open(cache_path, encoding='utf-8') as cache_file:
+        return json.load(cache_file)
+
+
+def save_cache(cache: Dict, cache_path: str):
+    """
+    Saves the cache of parsed transcripts of one data sub-folder. The file is written under a temporary name first, so
+    that an interrupted run does not leave a corrupted cache behind.
+
+    Input
+    :param cache: dictionary mapping transcript paths to their modification times and turn records
+    :param cache_path: path to the json cache file
+    """
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(tmp_path, cache_path)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                   FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_records(data_folder: str, conv_name_suf: str, cache_folder: str, workers: int = None) -> pd.DataFrame:
+    """
+    Collects turn records from all transcripts in the data folder (including its subfolders). Only the transcripts that
+    are not in the cache, or have been modified since, are parsed; this is done in a process pool. The transcripts are
+    cached under their path relative to the data folder, so the cache does not depend on how that folder is spelled.
+
+    Input
+    :param data_folder: path to the folder where the conversations are saved
+    :param conv_name_suf: suffix of the conversation file names
+    :param cache_folder: path to the folder holding the json cache files
+    :param workers: number of worker processes; defaults to the number of CPUs
+
+    Output
+    :return: DataFrame with one row per customer answer
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    paths = sorted(glob.glob(os.path.join(data_folder, '**', '*' + conv_name_suf), recursive=True))
+
+    # Group the transcripts by their sub-folder, keyed by their path relative to the data folder
+    keys = {path: os.path.relpath(path, data_folder).replace(os.sep, '/') for path in paths}
+    shards = {}
+    for path, key in keys.items():
+        shards.setdefault(key.rpartition('/')[0], []).append(path)
+
+    # Load the cache of every sub-folder, forgetting transcripts that no longer exist, and find what needs parsing
+    caches, stale, changed = {}, [], set()
+    for shard, shard_paths in shards.items():
+        cache = load_cache(shard_cache_path(cache_folder, shard))
+        caches[shard] = {keys[path]: cache[keys[path]] for path in shard_paths if keys[path] in cache}
+        if len(caches[shard]) != len(cache):
+            changed.add(shard)
+        for path in shard_paths:
+            mtime = os.path.getmtime(path)
+            if keys[path] not in caches[shard] or caches[shard][keys[path]]['mtime'] != mtime:
+                stale.append((shard, path, mtime))
+
+    # Parse only what is new or changed
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stale_paths = [path for _, path, _ in stale]
+            for (shard, path, mtime), records in zip(stale, pool.map(parse_conversation, stale_paths, chunksize=64)):
+                caches[shard][keys[path]] = {'mtime': mtime, 'records': records}
+                changed.add(shard)
+
+    # Rewrite only the caches that changed, and remove those of sub-folders that no longer exist
+    for shard in changed:
+        save_cache(caches[shard], shard_cache_path(cache_folder, shard))
+    current = {os.path.basename(shard_cache_path(cache_folder, shard)) for shard in shards}
+    for file_name in os.listdir(cache_folder):
+        if file_name.endswith('.json') and file_name not in current:
+            os.remove(os.path.join(cache_folder, file_name))
+
+    columns = ['file', 'date', 'turn', 'field', 'retry', 'answer', 'quit']
+    records = [record for path in paths for record in caches[keys[path].rpartition('/')[0]][keys[path]]['records']]
+    return pd.DataFrame(records, columns=columns)
+
+
+def field_stats(records: pd.DataFrame, by: List = None) -> pd.DataFrame:
+    """
+    Computes funnel and retry statistics per field: how many conversations reached the field, how many times it was
+    asked for and retried, and how many customers quit at it.
+
+    Input
+    :param records: turn records from `get_records()`
+    :param by: additional columns to group by, e.g. ['date']
+
+    Output
+    :return: DataFrame with the statistics, one row per field (and group)
+    """
+    keys = (by or []) + ['field']
+    grouped = records.groupby(keys, sort=False)
+    stats = pd.DataFrame({'Conversations': grouped['file'].nunique(),
+                          'Asked': grouped.size() - grouped['retry'].sum(),
+                          'Retries': grouped['retry'].sum(),
+                          'Quits': grouped['quit'].sum()})
+    stats['Retry rate'] = (stats['Retries'] / stats['Asked'].where(stats['Asked'] > 0)).round(2)
+    return stats
+
+
+def suggestion_stats(records: pd.DataFrame) -> pd.Series:
+    """
+    Computes how often brand spelling suggestions were offered, accepted, and declined.
+
+    Input
+    :param records: turn records from `get_records()`
+
+    Output
+    :return: Series with the counts and the acceptance rate
+    """
+    # Only the last answer to each offer counts, since invalid answers are followed by a retry
+    suggestions = records.loc[records['field'] == 'Brand suggestion']
+    offers = (~suggestions['retry']).cumsum()
+    answers = suggestions.groupby([suggestions['file'], offers])['answer'].last()
+    offered = len(answers)
+    accepted = int(answers.str.fullmatch(r'\d').sum())
+    return pd.Series({'Offered': offered,
+                      'Accepted': accepted,
+                      'Declined': offered - accepted,
+                      'Acceptance rate': round(accepted / offered, 2) if offered else None}, dtype=object)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                     MAIN
+# ----------------------------------------------------------------------------------------------------------------------
+
+def main(data_folder: str, conv_name_suf: str, cache_folder: str):
+    """
+    Parse the conversation archive and print the statistics.
+
+    Input
+    :param data_folder: path to the folder where the conversations are saved
+    :param conv_name_suf: suffix of the conversation file names
+    :param cache_folder: path to the folder holding the json cache files
+    """
+    records = get_records(data_folder, conv_name_suf, cache_folder)
+    conversations = records['file'].nunique()
+    quits = records.loc[records['quit'], 'file'].nunique()
+
+    print('Conversations: {0}, completed: {1}, quit: {2}\n'.format(conversations, conversations - quits, quits))
+    print('Statistics per field:')
+    print(field_stats(records).to_string())
+    print('\nStatistics per day and field:')
+    print(field_stats(records, by=['date']).to_string())
+    print('\nBrand suggestions:')
+    print(suggestion_stats(records).to_string())
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                     BODY
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    data_path = './data'  # path to the data folder
+    conv_suffix = 'conversation.txt'  # suffix of the conversation file names
+    cache_path = './conversation_stats_cache'  # path to the folder with the cache of parsed conversations
+
+    main(data_path, conv_suffix, cache_path)
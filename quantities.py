@@ -0,0 +1,194 @@
+"""
+Parsing of quantities entered with units, e.g. "12.8 L", "12800cc", "18 t" or "40,000 lb", and their normalization to
+cubic centimeters (engine size) and metric tonnes (weight and load). Both the comma and the dot are accepted as decimal
+separators, and the thousands can be grouped with commas, dots, spaces, or apostrophes. When a single separator is
+ambiguous, a dot is read as decimal ("12.800" is 12.8), while a comma followed by exactly three digits is read as
+thousands ("40,000" is 40000, but "12,8" is 12.8). Since a dot is also commonly used for thousands (e.g. "12.800 ccm"
+or "1.500 kg"), the quantities are checked against realistic limits, so that such values are rejected instead of being
+stored a thousand times too small.
+
+The same compiled pattern is used for single values entered in the conversation, and as a vectorized column operation
+for bulk data such as imports or historical fleet files.
+"""
+
+import re
+import math
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Optional
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                 HELPER FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+
+# A number with optional thousands grouping and decimal part, followed by an optional unit made of one or more words
+QUANTITY = re.compile(r"""
+    ^\s*
+    (?P<number>\d+(?:[\ '’\u00a0\u202f]\d{3})*(?:[.,]\d{3})*(?:[.,]\d*)?|[.,]\d+)
+    \s*
+    (?P<unit>[^\W\d_]\S*(?:\s+[^\W\d_]\S*)*)?
+    \s*$""", re.VERBOSE)
+
+# Characters which can only be used for grouping the thousands
+GROUPING = re.compile(r"[\s'’]")
+
+# Conversion factors to the target unit, for all recognized (lower case) unit names; no unit means the target unit
+# NOTE: "ton" is taken as a metric tonne, since that is what it means for most of our customers
+UNITS = {
+    'cc': {'': 1, 'cc': 1, 'ccm': 1, 'cm3': 1, 'cm³': 1, 'ml': 1,
+           'cubic centimeter': 1, 'cubic centimeters': 1, 'cubic centimetre': 1, 'cubic centimetres': 1,
+           'l': 1000, 'ltr': 1000, 'liter': 1000, 'liters': 1000, 'litre': 1000, 'litres': 1000,
+           'ci': 16.387064, 'cu in': 16.387064, 'cubic inch': 16.387064, 'cubic inches': 16.387064},
+    't': {'': 1, 't': 1, 'mt': 1, 'ton': 1, 'tons': 1, 'tonne': 1, 'tonnes': 1, 'metric ton': 1, 'metric tons': 1,
+          'metric tonne': 1, 'metric tonnes': 1,
+          'kg': 0.001, 'kgs': 0.001, 'kilogram': 0.001, 'kilograms': 0.001,
+          'lb': 0.00045359237, 'lbs': 0.00045359237, 'pound': 0.00045359237, 'pounds': 0.00045359237},
+}
+
+# Fleet table columns holding quantities, and their target units
+QUANTITY_COLUMNS = {'Engine (cc)': 'cc', 'Weight (T)': 't', 'Max load (T)': 't'}
+
+# Realistic limits of the quantities, in their target units
+QUANTITY_LIMITS = {'Engine (cc)': (50, 200000), 'Weight (T)': (0.1, 1000), 'Max load (T)': (0.1, 1000)}
+
+
+def normalize_unit(unit: str) -> str:
+    """
+    Brings the unit name to the form used in `UNITS`: lower case, single spaces, and no trailing dot.
+
+    Input
+    :param unit: unit name as entered by the user
+
+    Output
+    :return: normalized unit name
+    """
+    return ' '.join(unit.lower().split()).rstrip('.')
+
+
+def normalize_number(number: str) -> str:
+    """
+    Removes the thousands grouping from a number matched by `QUANTITY`, and converts its decimal separator to a dot.
+
+    Input
+    :param number: number as entered by the user
+
+    Output
+    :return: number that can be converted with `float()`
+    """
+    number = GROUPING.sub('', number)
+    commas, dots = number.count(','), number.count('.')
+
+    # Both separators: the last one is the decimal separator
+    if commas and dots:
+        thousands = '.' if number.rfind(',') > number.rfind('.') else ','
+        return number.replace(thousands, '').replace(',', '.')
+
+    # Repeated separator, or a single comma followed by exactly three digits: thousands
+    if commas > 1 or dots > 1 or re.fullmatch(r'[1-9]\d{0,2},\d{3}', number):
+        return number.replace(',', '').replace('.', '')
+
+    return number.replace(',', '.')
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+#                                                   FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+
+@lru_cache(maxsize=1024)
+def parse_quantity(text: str, unit: str) -> Optional[float]:
+    """
+    Parses a single quantity, e.g. "12.8 L", and converts it to the target unit. The result is cached, so that checking
+    the user input against the criterion and then converting it parses it only once.
+
+    Input
+    :param text: quantity as entered by the user
+    :param unit: target unit, one of the keys of `UNITS`
+
+    Output
+    :return: quantity in the target unit, or None if the text is not a (finite) quantity in a recognized unit
+    """
+    match = QUANTITY.match(text)
+    if match is None:
+        return None
+    factor = UNITS[unit].get(normalize_unit(match.group('unit') or ''))
+    if factor is None:
+        return None
+    quantity = float(normalize_number(match.group('number'))) * factor
+    return quantity if math.isfinite(quantity) else None
+
+
+def plausible_quantity(text: str, column: str) -> bool:
+    """
+    Checks whether the text is a quantity within the realistic limits of the given fleet table column.
+
+    Input
+    :param text: quantity as entered by the user
+    :param column: fleet table column, one of the keys of `QUANTITY_COLUMNS`
+
+    Output
+    :return: boolean determining whether the quantity is plausible
+    """
+    quantity = parse_quantity(text, QUANTITY_COLUMNS[column])
+    low, high = QUANTITY_LIMITS[column]
+    return quantity is not None and low <= quantity <= high
+
+
+def parse_quantity_column(values: pd.Series, unit: str) -> pd.Series:
+    """
+    Vectorized version of `parse_quantity()`, for whole columns of bulk data.
+
+    Input
+    :param values: quantities as entered by the users
+    :param unit: target unit, one of the keys of `UNITS`
+
+    Output
+    :return: float Series with quantities in the target unit, and NaN where the value could not be parsed
+    """
+    parts = values.astype(str).str.extract(QUANTITY)
+    number = parts['number'].str.replace(GROUPING, '', regex=True)
+    commas = number.str.count(',')
+    dots = number.str.count(r'\.')
+
+    # Decide on the decimal separator of every value with the same rules as in `normalize_number()`
+    decimal = np.select(
+        [(commas > 0) & (dots > 0),
+         (commas > 1) | (dots > 1) | number.str.fullmatch(r'[1-9]\d{0,2},\d{3}').fillna(False).astype(bool),
+         commas == 1],
+        [np.where(number.str.rfind(',') > number.str.rfind('.'), ',', '.'),
+         '',
+         ','],
+        default='.')
+    decimal = pd.Series(decimal, index=number.index)
+    number = number.where(decimal != ',', number.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    number = number.where(decimal != '.', number.str.replace(',', '', regex=False))
+    number = number.where(decimal != '', number.str.replace(r'[.,]', '', regex=True))
+
+    unit_names = parts['unit'].fillna('').str.lower().str.split().str.join(' ').str.rstrip('.')
+    factor = unit_names.map(UNITS[unit])
+
+    # Convert the same way as `float()` does in `parse_quantity()`, and drop the values that are too large for it
+    quantity = number.astype(float) * factor
+    return quantity.where(np.isfinite(quantity))
+
+
+def normalize_fleet(fleet: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes the engine size to cubic centimeters, and weight and maximal load to metric tonnes, for a whole fleet
+    table, e.g. from a bulk import or a historical fleet file. Values that could not be parsed, or are outside of
+    `QUANTITY_LIMITS`, become NaN.
+
+    Input
+    :param fleet: pandas DataFrame with the fleet information
+
+    Output
+    :return: copy of the fleet DataFrame with the normalized columns
+    """
+    fleet = fleet.copy()
+    for column, unit in QUANTITY_COLUMNS.items():
+        quantity = parse_quantity_column(fleet[column], unit)
+        fleet[column] = quantity.where(quantity.between(*QUANTITY_LIMITS[column]))
+    fleet['Engine (cc)'] = fleet['Engine (cc)'].round().astype('Int64')
+    fleet[['Weight (T)', 'Max load (T)']] = fleet[['Weight (T)', 'Max load (T)']].round(3)
+    return fleet
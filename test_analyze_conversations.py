@@ -0,0 +1,209 @@
+import os
+import pandas as pd
+import pytest
+import analyze_conversations
+from analyze_conversations import parse_conversation, get_records, field_stats, suggestion_stats
+from truck_fields import TRUCK_FIELDS
+
+
+MODEL_ERR_MSG = TRUCK_FIELDS[1][3]
+
+# Completed conversation with a retry, a brand suggestion answered only at the third attempt, and the old wording of the
+# question which truck to correct
+CORRECTING = ['Bot: Hello, I am here to help you organize your fleet.',
+              'Bot: Please tell me your name: ',
+              'Customer: Hans',
+              'Bot: What is the designation of this fleet? ',
+              'Customer: ABC',
+              'Bot: How many vehicles are there in this fleet? ',
+              'Customer: 1',
+              'Bot: ',
+              'Please provide details for vehicle nr. 1.',
+              'Bot: Brand: ',
+              'Customer: Hunda',
+              'Bot: You wrote Hunda. Did you mean (1) Hyundai, or (2) Honda (1/2/n)?',
+              'Customer: 5',
+              'Bot: Please choose one of the following: 1/2/n',
+              'Customer: whatever',
+              'Bot: Please choose one of the following: 1/2/n',
+              'Customer: 2',
+              'Bot: Model: ',
+              'Customer: xc',
+              'Bot: ' + MODEL_ERR_MSG,
+              'Customer: XC 302',
+              'Bot: Engine size (in cubic centimeters): ',
+              'Customer: 3000',
+              'Bot: Number of truck axles: ',
+              'Customer: 3',
+              'Bot: Truck weight in metric tonnes: ',
+              'Customer: 3.4',
+              'Bot: Truck maximal load in metric tonnes: ',
+              'Customer: 5',
+              'Bot: Please check if the following information is correct (y/n): ',
+              'Bot:           Brand   Honda     ',
+              'Bot: > ',
+              'Customer: y',
+              'Bot: ',
+              'Fleet information collected. Please take a look at the table and tell us if everything is correct (y/n).',
+              '',
+              'Bot:       Brand   Model',
+              '1          Honda  XC 302',
+              'Bot: ',
+              '',
+              'Bot: > ',
+              'Customer: n',
+              'Bot: Which fleet row contains incorrect information? ',
+              'Customer: 1']
+
+# Conversation with a pasted batch, a re-prompted cell, and a quit
+PASTING = ['Bot: Please tell me your name: ',
+           'Customer: Maria',
+           'Bot: What is the designation of this fleet? ',
+           'Customer: XY',
+           'Bot: How many vehicles are there in this fleet? ',
+           'Customer: 3',
+           'Bot: ',
+           'Please provide details for vehicle nr. 1.',
+           'Bot: Brand: ',
+           'Customer: Scania\tSC 1\t12800\t3\t8,5\t18',
+           'Bot: > ',
+           'Customer: Scania\tSC 2\t12800\tx\t8\t18',
+           'Bot: > ',
+           'Customer: ',
+           'Bot: Vehicle nr. 2, Please enter only a single- or double-digit whole number: ',
+           'Customer: 3',
+           'Bot: ',
+           'Please provide details for vehicle nr. 3.',
+           'Bot: Brand: ',
+           'Customer: q',
+           'Customer has quit!']
+
+CORRECTING_FILE = os.path.join('2020-03-03', 'a7', '2020-03-03_-_Hans_-_ABC_-_0a7_-_conversation.txt')
+PASTING_FILE = os.path.join('2020-03-04', 'b1', '2020-03-04_-_Maria_-_XY_-_0b1_-_conversation.txt')
+
+
+def write_transcript(data_folder, file_name, lines):
+    path = os.path.join(str(data_folder), file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as conv_file:
+        conv_file.write(''.join(line + '\n' for line in lines))
+    return path
+
+
+@pytest.fixture
+def archive(tmp_path):
+    data_folder = tmp_path / 'data'
+    write_transcript(data_folder, CORRECTING_FILE, CORRECTING)
+    write_transcript(data_folder, PASTING_FILE, PASTING)
+    return str(data_folder)
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """
+    Runs the parsing serially, and records which transcripts were parsed.
+    """
+    parsed_paths = []
+
+    class SerialExecutor:
+        def __init__(self, max_workers=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def map(self, fn, paths, chunksize=1):
+            parsed_paths.extend([os.path.basename(path) for path in paths])
+            return map(fn, paths)
+
+    monkeypatch.setattr(analyze_conversations, 'ProcessPoolExecutor', SerialExecutor)
+    return parsed_paths
+
+
+def test_parse_conversation_with_retries_and_suggestions(archive):
+    records = parse_conversation(os.path.join(archive, CORRECTING_FILE))
+
+    assert [(record['field'], record['retry']) for record in records] == [
+        ('Name', False), ('Fleet ID', False), ('Vehicle count', False),
+        ('Brand', False), ('Brand suggestion', False), ('Brand suggestion', True), ('Brand suggestion', True),
+        ('Model', False), ('Model', True),
+        ('Engine (cc)', False), ('Axle number', False), ('Weight (T)', False), ('Max load (T)', False),
+        ('Truck confirmation', False), ('Fleet confirmation', False), ('Truck to correct', False)]
+    assert records[0]['date'] == '2020-03-03'
+    assert not any([record['quit'] for record in records])
+
+
+def test_parse_conversation_with_batch_and_quit(archive):
+    records = parse_conversation(os.path.join(archive, PASTING_FILE))
+
+    assert [(record['field'], record['retry']) for record in records] == [
+        ('Name', False), ('Fleet ID', False), ('Vehicle count', False),
+        ('Batch row', False), ('Batch row', False), ('Batch row', False),
+        ('Axle number', True),
+        ('Brand', False)]
+    assert [record['quit'] for record in records] == [False] * 7 + [True]
+
+
+def test_get_records_only_parses_new_and_changed_transcripts(archive, parsed, tmp_path):
+    cache_folder = str(tmp_path / 'cache')
+
+    first = get_records(archive, 'conversation.txt', cache_folder)
+    assert sorted(parsed) == sorted([os.path.basename(CORRECTING_FILE), os.path.basename(PASTING_FILE)])
+    assert sorted(os.listdir(cache_folder)) == ['2020-03-03_a7.json', '2020-03-04_b1.json']
+
+    # Nothing to parse the second time, also when the data folder is spelled differently
+    parsed.clear()
+    second = get_records(os.path.join(archive, '.', ''), 'conversation.txt', cache_folder)
+    assert parsed == []
+    pd.testing.assert_frame_equal(first, second)
+
+    # A modified transcript is parsed again, and only its cache file is rewritten
+    untouched_cache = os.path.join(cache_folder, '2020-03-04_b1.json')
+    untouched_mtime = os.stat(untouched_cache).st_mtime_ns
+    path = os.path.join(archive, CORRECTING_FILE)
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 10))
+    get_records(archive, 'conversation.txt', cache_folder)
+    assert parsed == [os.path.basename(CORRECTING_FILE)]
+    assert os.stat(untouched_cache).st_mtime_ns == untouched_mtime
+
+
+def test_get_records_forgets_deleted_transcripts(archive, parsed, tmp_path):
+    cache_folder = str(tmp_path / 'cache')
+    get_records(archive, 'conversation.txt', cache_folder)
+
+    os.remove(os.path.join(archive, PASTING_FILE))
+    parsed.clear()
+    records = get_records(archive, 'conversation.txt', cache_folder)
+
+    assert parsed == []
+    assert records['file'].unique().tolist() == [os.path.basename(CORRECTING_FILE)]
+    assert os.listdir(cache_folder) == ['2020-03-03_a7.json']
+
+
+def test_field_stats():
+    records = pd.DataFrame({'file': ['a', 'a', 'a', 'b', 'b', 'b'],
+                            'date': ['2020-03-03'] * 3 + ['2020-03-04'] * 3,
+                            'field': ['Name', 'Model', 'Model', 'Name', 'Model', 'Engine (cc)'],
+                            'retry': [False, False, True, False, False, False],
+                            'quit': [False, False, False, False, False, True]})
+
+    stats = field_stats(records)
+
+    assert stats.loc['Name'].tolist() == [2, 2, 0, 0, 0.0]
+    assert stats.loc['Model'].tolist() == [2, 2, 1, 0, 0.5]
+    assert stats.loc['Engine (cc)'].tolist() == [1, 1, 0, 1, 0.0]
+    assert field_stats(records, by=['date']).loc[('2020-03-03', 'Model'), 'Retries'] == 1
+
+
+def test_suggestion_stats():
+    records = pd.DataFrame({'file': ['a', 'a', 'a', 'b'],
+                            'field': ['Brand suggestion'] * 4,
+                            'retry': [False, True, True, False],
+                            'answer': ['5', 'whatever', '2', 'n']})
+
+    stats = suggestion_stats(records)
+
+    assert stats.to_dict() == {'Offered': 2, 'Accepted': 1, 'Declined': 1, 'Acceptance rate': 0.5}
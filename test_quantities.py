@@ -0,0 +1,86 @@
+import io
+import math
+import pandas as pd
+import pytest
+from quantities import parse_quantity, parse_quantity_column, plausible_quantity, normalize_fleet
+
+
+# Text, target unit, and the expected quantity (None if it should not be parsed)
+CASES = [
+    ('12.8 L', 'cc', 12800),
+    ('12800cc', 'cc', 12800),
+    ('12800', 'cc', 12800),
+    ('40,000 lb', 't', 18.1436948),
+    ('18 t', 't', 18),
+    ('8,5', 't', 8.5),
+    ('1.234,5 kg', 't', 1.2345),
+    ('1,234.5', 't', 1234.5),
+    ('12.800', 't', 12.8),
+    ('1 234', 'cc', 1234),
+    ('5.', 't', 5),
+    ('12.800 ccm', 'cc', 12.8),  # a single dot is read as decimal, see `test_plausible_quantity()`
+    ('1.500 kg', 't', 0.0015),
+    ('40.000 lb', 't', 0.018143695),
+    ('0.4', 'cc', 0.4),
+    ('0.0004 t', 't', 0.0004),
+    ('', 'cc', None),
+    ('9' * 400, 'cc', None),  # overflows to infinity
+    ('12 parsecs', 't', None),  # unknown unit
+    ('18 t', 'cc', None),  # unit of the wrong kind
+    ('-5', 't', None),
+]
+
+
+@pytest.mark.parametrize('text, unit, expected', CASES)
+def test_parse_quantity(text, unit, expected):
+    if expected is None:
+        assert parse_quantity(text, unit) is None
+    else:
+        assert parse_quantity(text, unit) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('unit', ['cc', 't'])
+def test_parse_quantity_column_agrees_with_parse_quantity(unit):
+    texts = [text for text, _, _ in CASES]
+
+    column = parse_quantity_column(pd.Series(texts), unit)
+
+    for text, value in zip(texts, column):
+        scalar = parse_quantity(text, unit)
+        if scalar is None:
+            assert math.isnan(value), text
+        else:
+            assert value == pytest.approx(scalar), text
+
+
+@pytest.mark.parametrize('text, column, expected', [
+    ('12800 ccm', 'Engine (cc)', True),
+    ('12.8 L', 'Engine (cc)', True),
+    ('12.800 ccm', 'Engine (cc)', False),  # European thousands, would be stored as 13 cc
+    ('0.4', 'Engine (cc)', False),  # would be stored as 0 cc
+    ('1500 kg', 'Weight (T)', True),
+    ('1.500 kg', 'Weight (T)', False),
+    ('0.0004 t', 'Weight (T)', False),  # would be stored as 0.0 t
+    ('40,000 lb', 'Max load (T)', True),
+    ('40.000 lb', 'Max load (T)', False),
+    ('1001 t', 'Max load (T)', False),
+    ('lots', 'Max load (T)', False),
+])
+def test_plausible_quantity(text, column, expected):
+    assert plausible_quantity(text, column) == expected
+
+
+def test_normalize_fleet():
+    fleet = pd.read_csv(io.StringIO('Truck nr.,Brand,Model,Engine (cc),Axle number,Weight (T),Max load (T)\n'
+                                    '1,Mercedez,SC 3200,3600,5,3.5,8.2\n'
+                                    '2,Honda,XC 302,12.8 L,3,"3,4",5.\n'
+                                    '3,Yamaha,RR 387,lots,3,2600 kg,"40,000 lb"\n'
+                                    '4,Volvo,FH 16,12.800 ccm,3,1.500 kg,"40.000 lb"\n'), index_col=0)
+
+    fleet = normalize_fleet(fleet)
+
+    assert fleet['Engine (cc)'].tolist() == [3600, 12800, pd.NA, pd.NA]
+    assert fleet['Weight (T)'].tolist()[:3] == [3.5, 3.4, 2.6]
+    assert fleet['Max load (T)'].tolist()[:3] == [8.2, 5.0, 18.144]
+    assert fleet.loc[4, ['Weight (T)', 'Max load (T)']].isna().all()  # implausible values are not stored
+    assert fleet['Brand'].tolist() == ['Mercedez', 'Honda', 'Yamaha', 'Volvo']
@@ -0,0 +1,154 @@
+import io
+import os
+import pytest
+import truck_bot
+
+
+@pytest.fixture
+def dialogue(monkeypatch):
+    """
+    Feeds the given lines to the bot as user input, and skips the pauses in the conversation.
+    """
+    monkeypatch.setattr(truck_bot.time, 'sleep', lambda _: None)
+    monkeypatch.setattr(truck_bot, 'fleet_path', None)
+    monkeypatch.setattr(truck_bot, 'conv_path', None)
+
+    def feed(*lines):
+        stdin = io.StringIO(''.join(line + '\n' for line in lines))
+        monkeypatch.setattr('sys.stdin', stdin)
+        return stdin
+    return feed
+
+
+def test_batch_rows_filling_the_fleet_read_closing_empty_line(dialogue):
+    stdin = dialogue('2',
+                     'Scania\tSC 1\t12800\t3\t8,5\t18',
+                     'Scania\tSC 2\t12.8 L\t3\t8\t40,000 lb',
+                     '',
+                     'y')
+
+    fleet, conv = truck_bot.get_fleet(['Scania'], [])
+
+    assert len(fleet) == 2
+    assert fleet['Engine (cc)'].tolist() == [12800, 12800]
+    assert fleet['Weight (T)'].tolist() == [8.5, 8.0]
+    assert conv[-2:] == ['Bot: > ', 'Customer: y']  # the fleet table was confirmed by the user, not by the empty line
+    assert stdin.read() == ''
+
+
+def test_batch_rows_beyond_the_fleet_are_ignored(dialogue):
+    dialogue('1',
+             'Scania\tSC 1\t12800\t3\t8,5\t18',
+             'Scania\tSC 2\t12800\t3\t8\t18',
+             '',
+             'y')
+
+    fleet, conv = truck_bot.get_fleet(['Scania'], [])
+
+    assert fleet['Model'].tolist() == ['SC 1']
+    assert 'Bot: Only 1 more vehicle(s) fit in this fleet, so the last 1 row(s) will be ignored.' in conv
+
+
+def test_merge_batch_cells_restores_thousands_separator():
+    cells = truck_bot.parse_batch_row('Scania,SC 1,12,800,3,8.5,18')
+
+    assert truck_bot.merge_batch_cells(cells) == [['Scania', 'SC 1', '12,800', '3', '8.5', '18']]
+
+
+def test_merge_batch_cells_finds_all_readings_of_decimal_comma():
+    cells = truck_bot.parse_batch_row('Scania,SC 1,12800,3,8,5,18')
+
+    assert ['Scania', 'SC 1', '12800', '3', '8,5', '18'] in truck_bot.merge_batch_cells(cells)
+
+
+def test_ambiguous_comma_row_is_resolved_by_choice(dialogue):
+    cells = truck_bot.parse_batch_row('Scania,SC 1,12800,3,8,5,18')
+    choice = truck_bot.merge_batch_cells(cells).index(['Scania', 'SC 1', '12800', '3', '8,5', '18']) + 1
+    dialogue('1',
+             'Scania,SC 1,12800,3,8,5,18',
+             '',
+             str(choice),
+             'y')
+
+    fleet, conv = truck_bot.get_fleet(['Scania'], [])
+
+    assert fleet.iloc[0].tolist() == ['Scania', 'SC 1', 12800, '3', 8.5, 18.0]
+    assert not any(['please enter the row again' in line for line in conv])
+
+
+def test_get_basic_info_without_random_user(dialogue, tmp_path):
+    dialogue('Hans Kristian', 'ABC 123')
+
+    fleet_path, conv_path, _ = truck_bot.get_basic_info(str(tmp_path), 'fleetdata.csv', 'conversation.txt',
+                                                        '2020-03-03', [])
+
+    assert os.path.dirname(fleet_path) == os.path.dirname(conv_path)
+    assert os.path.isdir(os.path.dirname(conv_path))
+    assert os.path.basename(conv_path).startswith('2020-03-03_-_HansKristian_-_ABC123_-_')
+
+
+def test_allocate_paths_reserves_conversation_file(tmp_path):
+    session_id = truck_bot.new_session_id()
+
+    _, conv_path, allocated_id = truck_bot.allocate_paths(str(tmp_path), '2020-03-03', 'Hans', 'ABC', session_id,
+                                                          'fleetdata.csv', 'conversation.txt')
+
+    assert allocated_id == session_id
+    assert os.path.isfile(conv_path) and os.path.getsize(conv_path) == 0
+
+
+def test_allocate_paths_draws_new_session_id_if_taken(tmp_path):
+    session_id = truck_bot.new_session_id()
+    _, conv_path, _ = truck_bot.allocate_paths(str(tmp_path), '2020-03-03', 'Hans', 'ABC', session_id,
+                                               'fleetdata.csv', 'conversation.txt')
+
+    # Another process allocating with the same session ID runs into the exclusive creation of the reserved file
+    _, new_conv_path, new_session_id = truck_bot.allocate_paths(str(tmp_path), '2020-03-03', 'Hans', 'ABC',
+                                                                session_id, 'fleetdata.csv', 'conversation.txt')
+
+    assert new_session_id != session_id
+    assert new_conv_path != conv_path
+    assert os.path.isfile(conv_path) and os.path.isfile(new_conv_path)
+
+
+def test_get_basic_info_replaces_placeholder_reservation(dialogue, tmp_path, monkeypatch):
+    session_id = truck_bot.new_session_id()
+    _, placeholder_path, _ = truck_bot.allocate_paths(str(tmp_path), '2020-03-03', 'user', 'fleet', session_id,
+                                                      'fleetdata.csv', 'conversation.txt')
+    monkeypatch.setattr(truck_bot, 'conv_path', placeholder_path)
+    dialogue('Hans', 'ABC', 'q')
+
+    _, conv_path, conv = truck_bot.get_basic_info(str(tmp_path), 'fleetdata.csv', 'conversation.txt', '2020-03-03',
+                                                  [], session_id)
+
+    assert not os.path.exists(placeholder_path)
+    assert session_id in conv_path
+
+    # The conversation is then written into the reserved file
+    with pytest.raises(SystemExit):
+        truck_bot.ask('How many vehicles are there in this fleet? ', conv)
+    with open(conv_path) as conv_file:
+        assert conv_file.read().splitlines()[-2:] == ['Customer: q', 'Customer has quit!']
+
+
+def test_implausible_quantities_are_asked_again(dialogue):
+    stdin = dialogue('Scania', 'SC 1', '9' * 400, '0', '12.8 L', '3', '8,5 t', '40,000 lb', 'y')
+
+    trucks, conv = truck_bot.get_trucks(1, 1, ['Scania'], [])
+
+    assert trucks[0]['Engine (cc)'] == 12800
+    assert trucks[0]['Max load (T)'] == 18.144
+    assert stdin.read() == ''
+
+
+@pytest.mark.parametrize('column, text', [
+    ('Engine (cc)', '12.800 ccm'),
+    ('Engine (cc)', '0.4'),
+    ('Weight (T)', '1.500 kg'),
+    ('Weight (T)', '0.0004 t'),
+    ('Max load (T)', '40.000 lb'),
+])
+def test_truck_fields_reject_values_that_would_be_stored_wrongly(column, text):
+    criterion = {field[0]: field[2] for field in truck_bot.TRUCK_FIELDS}[column]
+
+    assert not criterion(text)
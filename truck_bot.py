@@ -1,15 +1,21 @@
 import os
 import re
+import csv
 import sys
 import time
-import random
 import difflib
+import itertools
 import get_truck_brand_names
 import pandas as pd
 from datetime import datetime
+from quantities import QUANTITY_COLUMNS
+from truck_fields import TRUCK_FIELDS, is_batch_row
 from typing import Tuple, List, Callable
 
 
+# Paths to the fleet data file and conversation data file of the current session, see `allocate_paths()`
+fleet_path, conv_path = None, None
+
 # ----------------------------------------------------------------------------------------------------------------------
 #                                                 HELPER FUNCTIONS
 # ----------------------------------------------------------------------------------------------------------------------
@@ -89,19 +95,19 @@ def negative_answer(statement: str) -> bool:
 def save_fleet(fleet: pd.DataFrame):
     """
     Saves the fleet data in the designated folder as a cvs file.
-    NOTE: assumes that the save folder already exists!
+    NOTE: the save folder is created beforehand by `allocate_paths()`.
 
     Args:
     :param fleet: pandas DataFrame that holds the fleet information
     """
     global fleet_path
-    fleet.to_csv(fleet_path)
+    fleet.to_csv(fleet_path, mode='x')
 
 
 def save_conv(conv: List, flag: str = ''):
     """
     Saves the conversation data in the designated folder as a txt file.
-    NOTE: assumes that the save folder already exists!
+    NOTE: the file is created (i.e. reserved for this session) beforehand by `allocate_paths()`.
 
     Args:
     :param conv: ongoing conversation list
@@ -109,39 +115,89 @@ def save_conv(conv: List, flag: str = ''):
     """
     global conv_path
 
-    with open(conv_path, 'x') as conv_file:
+    with open(conv_path, 'w') as conv_file:
         for line in conv:
             conv_file.write('{0}\n'.format(line))
         if flag == 'quit':
             conv_file.write('Customer has quit!\n')
 
 
-def generate_random_user(fleet_name_suf: str, conv_name_suf: str) -> Tuple[str, str, str]:
+def new_session_id() -> str:
+    """
+    Generates a unique, time-ordered session ID: 12 hex digits of the current time in milliseconds followed by 20 hex
+    digits of randomness (similar to ULID/UUIDv7). Sorting the IDs sorts the sessions by their start time, and two bot
+    processes would have to start in the same millisecond and draw the same 80 random bits to collide.
+
+    Returns:
+    :return: session ID as a 32 character hex string
+    """
+    return '{0:012x}{1}'.format(int(time.time() * 1000), os.urandom(10).hex())
+
+
+def allocate_paths(data_folder: str, date_now: str, username: str, fleet_id: str, session_id: str,
+                   fleet_name_suf: str, conv_name_suf: str) -> Tuple[str, str, str]:
+    """
+    Constructs the fleet and conversation paths for the current session, and creates the folder they will be saved in.
+    In order to keep every folder small, the data is sharded by date and by the first random byte of the session ID,
+    e.g. `data/2020-03-03/a7/2020-03-03_-_HansKristian_-_ABC123_-_<session ID>_-_conversation.txt`.
+    The conversation file is reserved right away by creating it in exclusive mode, which is atomic even when several
+    bot processes allocate paths at the same time; if it already exists, a new session ID is drawn. Since the session
+    ID is part of the file names, the fleet data file is then unique as well.
+
+    Args:
+    :param data_folder: folder path where data is stored
+    :param date_now: today's date
+    :param username: name of the current user
+    :param fleet_id: ID/designation of the fleet
+    :param session_id: ID of the current session, from `new_session_id()`
+    :param fleet_name_suf: suffix for creating the fleet file name
+    :param conv_name_suf: suffix for creating the conversation file name
+
+    Returns:
+    :return: paths to the fleet data file and conversation data file, and the (possibly new) session ID
+    """
+    while True:
+        shard = os.path.join(data_folder, date_now, session_id[12:14])
+        os.makedirs(shard, exist_ok=True)
+
+        fn_base = '_-_'.join([date_now, username, fleet_id, session_id])
+        fleet_path = os.path.join(shard, '_-_'.join([fn_base, fleet_name_suf]))
+        conv_path = os.path.join(shard, '_-_'.join([fn_base, conv_name_suf]))
+        try:
+            open(conv_path, 'x').close()
+        except FileExistsError:
+            session_id = new_session_id()
+            continue
+
+        return fleet_path, conv_path, session_id
+
+
+def generate_random_user(fleet_name_suf: str, conv_name_suf: str) -> Tuple[str, str, str, str]:
     """
-    Generates random client username and truck fleet ID.
+    Generates a new session, together with a placeholder client username and truck fleet ID derived from it.
 
     Args:
     :param fleet_name_suf: suffix for creating the fleet file name
     :param conv_name_suf: suffix for creating the conversation file name
 
     Returns
-    :return: paths to the fleet data file and conversation data file, and today's date
+    :return: paths to the fleet data file and conversation data file, today's date, and the session ID
     """
     global fleet_path, conv_path
 
     # Get the current date and form a string out of it
     date_now = '{0}'.format(datetime.date(datetime.now()))
 
-    # Construct random username and fleet ID
-    rand = random.randint(1, 100000)
-    username = 'user' + str(rand)
-    fleet_id = 'fleet' + str(rand)
+    # Start a new session and construct placeholder username and fleet ID
+    session_id = new_session_id()
+    username = 'user' + session_id[-6:]
+    fleet_id = 'fleet' + session_id[-6:]
 
     # Construct conversation path and fleet path
-    fleet_path = os.path.join(data_path, '_-_'.join([date_now, username, fleet_id, fleet_name_suf]))
-    conv_path = os.path.join(data_path, '_-_'.join([date_now, username, fleet_id, conv_name_suf]))
+    fleet_path, conv_path, session_id = allocate_paths(data_path, date_now, username, fleet_id, session_id,
+                                                       fleet_name_suf, conv_name_suf)
 
-    return fleet_path, conv_path, date_now
+    return fleet_path, conv_path, date_now, session_id
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -163,8 +219,8 @@ def load_brands(data: str) -> Tuple[pd.DataFrame, List]:
     return brands_table, brands
 
 
-def get_basic_info(data_folder, fleet_name_suf: str, conv_name_suf: str, date_now: str, conv: List) -> \
-        Tuple[str, str, List]:
+def get_basic_info(data_folder, fleet_name_suf: str, conv_name_suf: str, date_now: str, conv: List,
+                   session_id: str = None) -> Tuple[str, str, List]:
     """
     From the basic info and the current date, constructs the base of the file name that will be used for storing the
     fleet data and the conversation history.
@@ -180,6 +236,7 @@ def get_basic_info(data_folder, fleet_name_suf: str, conv_name_suf: str, date_no
     :param conv_name_suf: suffix for creating the conversation file name
     :param date_now: today's date
     :param conv: ongoing conversation list
+    :param session_id: ID of the current session; a new one is generated if not given
 
     Returns:
     :return: name of the current user, ID/designation of the fleet, and the ongoing conversation list
@@ -194,12 +251,14 @@ def get_basic_info(data_folder, fleet_name_suf: str, conv_name_suf: str, date_no
     username = ''.join(username.split(' '))
     fleet_id = ''.join(fleet_id.split(' '))
 
-    # Construct the base file name
-    fn_base = '_-_'.join([date_now, username, fleet_id])
+    # Construct the full fleet and conversation paths within this session's shard
+    placeholder_path = conv_path
+    fleet_path, conv_path, _ = allocate_paths(data_folder, date_now, username, fleet_id,
+                                              session_id or new_session_id(), fleet_name_suf, conv_name_suf)
 
-    # Construct the full fleet and conversation paths
-    fleet_path = os.path.join(data_folder, fn_base + fleet_name_suf)  # construct the fleet file path
-    conv_path = os.path.join(data_folder, fn_base + conv_name_suf)  # construct the conversation file path
+    # Release the (still empty) conversation file reserved for the placeholder user by `generate_random_user()`
+    if placeholder_path is not None and os.path.isfile(placeholder_path) and os.path.getsize(placeholder_path) == 0:
+        os.remove(placeholder_path)
 
     # Output the data
     return fleet_path, conv_path, conv
@@ -253,6 +312,29 @@ def check_brand_name(input_msg: str, criterion: Callable, err_msg: str, brand_li
     # Get user input in the standard way
     original_brand, conv = get_input(input_msg, criterion, err_msg, conv)
 
+    # Cross-reference it with the list of known brands
+    return correct_brand_name(original_brand, input_msg, criterion, err_msg, brand_list, conv)
+
+
+def correct_brand_name(original_brand: str, input_msg: str, criterion: Callable, err_msg: str, brand_list: List,
+                       conv: List) -> Tuple[str, List]:
+    """
+    Cross-references an already entered brand name with the list of all truck manufacturers, and if it detects a
+    spelling error it offers the user several possible corrections. If the user wants to try again, the brand name is
+    collected anew through `check_brand_name()`.
+
+    Args:
+    :param original_brand: brand name as entered by the user
+    :param input_msg: original message to the user, prompting for input
+    :param criterion: criterion that user input needs to pass
+    :param err_msg: error message to the user if the input does not pass the criterion
+    :param brand_list: list of all unique truck manufacturer names
+    :param conv: ongoing conversation list
+
+    Returns:
+    :return: corrected brand name, ongoing conversation list
+    """
+
     # Find the nearest matches to the user input
     match = difflib.get_close_matches(original_brand, brand_list, n=3, cutoff=0.4)
 
@@ -316,7 +398,7 @@ def check_brand_name(input_msg: str, criterion: Callable, err_msg: str, brand_li
     return corrected_brand, conv
 
 
-def get_single_truck(truck_nr: int, truck_brands: List, conv: List) -> Tuple[pd.Series, List]:
+def get_single_truck(truck_nr: int, truck_brands: List, conv: List, brand: str = None) -> Tuple[pd.Series, List]:
     """
     Collects all the relevant information about a single truck in the fleet and returns it in pandas Series.
 
@@ -324,52 +406,25 @@ def get_single_truck(truck_nr: int, truck_brands: List, conv: List) -> Tuple[pd.
     :param truck_nr: number of the truck in the fleet
     :param truck_brands: list of unique truck brands
     :param conv: ongoing conversation list
+    :param brand: brand name, if it has already been collected by the caller
 
     Returns:
     :return: pandas Series with truck information, ongoing conversation list
     """
-    conv = say('\nPlease provide details for vehicle nr. {0}.'.format(truck_nr), conv)
-
-    # Get truck name
-    input_msg = 'Brand: '
-    criterion = str.isalpha
-    err_msg = 'Brand name should not contain only letters; please try again: '
-    brand, conv = check_brand_name(input_msg, criterion, err_msg, truck_brands, conv)
-
-    # Get truck model; TODO: ask a domain expert what would be a more general model name pattern
-    input_msg = 'Model: '
-    criterion = lambda x: re.match(r'[a-zA-Z]{2} \d+', x)  # assume this pattern due to lack of domain expertise
-    err_msg = 'Model name should have the pattern of two letters followed by space followed by a series of numbers,' \
-              'e.g. "SC 3200"; please try again: '
-    model, conv = get_input(input_msg, criterion, err_msg, conv)
-
-    # Get truck engine size in cubic centimeters
-    input_msg = 'Engine size (in cubic centimeters): '  # TODO: would be nice to have unit awareness and conversion
-    criterion = lambda x: re.match(r'^\d+$', x)
-    err_msg = 'Engine size should contain only numbers; please try again: '
-    engine_size, conv = get_input(input_msg, criterion, err_msg, conv)
-
-    # Get number of truck axles
-    input_msg = 'Number of truck axles: '
-    criterion = lambda x: re.match(r'^\d{1,2}$', x)
-    err_msg = 'Please enter only a single- or double-digit whole number: '
-    axle_number, conv = get_input(input_msg, criterion, err_msg, conv)
-
-    # Get truck weight in tonnes
-    input_msg = 'Truck weight in metric tonnes: '
-    criterion = lambda x: re.match(r'^\d+(\.\d*)?$', x)
-    err_msg = 'Truck weight should contain only whole or decimal numbers; please try again: '
-    weight, conv = get_input(input_msg, criterion, err_msg, conv)
-
-    # Get maximal load of the truck in tonnes
-    input_msg = 'Truck maximal load in metric tonnes: '
-    criterion = lambda x: re.match(r'^\d+(\.\d*)?$', x)
-    err_msg = 'Maximal load should contain only whole or decimal numbers; please try again: '
-    max_load, conv = get_input(input_msg, criterion, err_msg, conv)
+    # Get truck name, unless the caller already did that
+    if brand is None:
+        conv = say('\nPlease provide details for vehicle nr. {0}.'.format(truck_nr), conv)
+        _, input_msg, criterion, err_msg, _ = TRUCK_FIELDS[0]
+        brand, conv = check_brand_name(input_msg, criterion, err_msg, truck_brands, conv)
+
+    # Get the rest of the truck properties: model, engine size, number of axles, weight, and maximal load
+    values = [brand]
+    for _, input_msg, criterion, err_msg, convert in TRUCK_FIELDS[1:]:
+        value, conv = get_input(input_msg, criterion, err_msg, conv)
+        values.append(convert(value))
 
     # Put it all in the Series
-    truck = pd.Series(data=[brand, model, engine_size, axle_number, weight, max_load],
-                      index=['Brand', 'Model', 'Engine (cc)', 'Axle number', 'Weight (T)', 'Max load (T)'])
+    truck = pd.Series(data=values, index=[field[0] for field in TRUCK_FIELDS])
 
     # Check if the information is correct
     conv = say('Please check if the following information is correct (y/n): ', conv)
@@ -385,6 +440,191 @@ def get_single_truck(truck_nr: int, truck_brands: List, conv: List) -> Tuple[pd.
     return truck, conv
 
 
+def parse_batch_row(statement: str) -> List[str]:
+    """
+    Splits a single pasted row into its cells. Tab-separated rows (e.g. copied from a spreadsheet) take precedence over
+    comma-separated ones, so that decimal commas inside tab-separated cells survive. Quoted CSV cells are supported.
+
+    Args:
+    :param statement: user input holding one truck per line
+
+    Returns:
+    :return: list of stripped cell values
+    """
+    delimiter = '\t' if '\t' in statement else ','
+    cells = next(csv.reader([statement], delimiter=delimiter, skipinitialspace=True), [])
+    return [cell.strip() for cell in cells]
+
+
+def merge_batch_cells(cells: List[str]) -> List[List[str]]:
+    """
+    A comma-separated row splits decimal commas and thousands separators too, e.g. "Scania,SC 1,12800,3,8,5,18" gives
+    seven cells instead of six. This function finds all the ways in which the extra cells can be merged back into the
+    quantity fields (see `QUANTITY_COLUMNS`) so that every cell passes its criterion.
+
+    Args:
+    :param cells: cells of a comma-separated row, more than there are truck fields
+
+    Returns:
+    :return: list of possible rows, each with one cell per truck field
+    """
+    extra = len(cells) - len(TRUCK_FIELDS)
+    mergeable = [ii for ii, field in enumerate(TRUCK_FIELDS) if field[0] in QUANTITY_COLUMNS]
+
+    candidates = []
+    for spans in itertools.product(range(extra + 1), repeat=len(mergeable)):
+        if sum(spans) != extra:
+            continue
+
+        # Build the row, with every mergeable field taking its share of the extra cells
+        merged, start = [], 0
+        for ii in range(len(TRUCK_FIELDS)):
+            end = start + 1 + (spans[mergeable.index(ii)] if ii in mergeable else 0)
+            merged.append(','.join(cells[start:end]))
+            start = end
+
+        if all([field[2](cell) for field, cell in zip(TRUCK_FIELDS, merged)]):
+            candidates.append(merged)
+
+    return candidates
+
+
+def choose_batch_cells(row_nr: int, candidates: List[List[str]], conv: List) -> Tuple[List[List[str]], List]:
+    """
+    Asks the user which of the several possible readings of a comma-separated row is the correct one.
+
+    Args:
+    :param row_nr: number of the truck in the fleet
+    :param candidates: possible rows from `merge_batch_cells()`
+    :param conv: ongoing conversation list
+
+    Returns:
+    :return: list with the chosen row, or an empty list if none of them is correct; ongoing conversation list
+    """
+    # Only show the fields from the first one that can differ onwards
+    first = min([ii for ii, field in enumerate(TRUCK_FIELDS) if field[0] in QUANTITY_COLUMNS])
+    readings = [' | '.join(['{0} {1}'.format(field[0], cell)
+                            for field, cell in zip(TRUCK_FIELDS[first:], row[first:])])
+                for row in candidates]
+
+    question = 'Vehicle nr. {0} can be read in several ways. Did you mean {1} ({2}/n)? '.format(
+        row_nr,
+        ', or '.join(['({0}) {1}'.format(ii + 1, reading) for ii, reading in enumerate(readings)]),
+        '/'.join([str(ii + 1) for ii in range(len(candidates))]))
+    choice, conv = ask(question, conv)
+
+    # Check if the input is valid
+    permitted = [str(ii + 1) for ii in range(len(candidates))] + ['n', 'no', 'not']
+    while choice.lower() not in permitted:
+        choice, conv = ask('Please choose one of the following: ' + '/'.join(permitted[:-2]) + '/n', conv)
+
+    if negative_answer(choice):
+        return [], conv
+    return [candidates[int(choice) - 1]], conv
+
+
+def get_batch_trucks(first_row: str, truck_nr: int, total_trucks: int, truck_brands: List, conv: List) -> \
+        Tuple[List[pd.Series], List]:
+    """
+    Collects several trucks pasted in one go, one truck per line, as comma- or tab-separated values in the order of
+    `TRUCK_FIELDS`. The rows are read until an empty line is entered, and are then validated together with the same
+    criteria as in `get_single_truck()`. Only the cells which do not pass are asked for again, and the trucks are not
+    confirmed one by one, since the whole fleet is verified in `check_fleet()` anyway.
+
+    Args:
+    :param first_row: the first pasted row, already entered at the brand prompt
+    :param truck_nr: number of the first pasted truck in the fleet
+    :param total_trucks: total number of trucks in the fleet
+    :param truck_brands: list of unique truck brands
+    :param conv: ongoing conversation list
+
+    Returns:
+    :return: list of pandas Series with truck information, ongoing conversation list
+    """
+    columns = [field[0] for field in TRUCK_FIELDS]
+
+    # Collect the rest of the pasted rows, skipping the header if the user copied it along. The closing empty line is
+    # always read, even if the fleet is already full, so that it does not answer the next question.
+    rows = [] if parse_batch_row(first_row)[0].lower() == columns[0].lower() else [first_row]
+    while True:
+        statement, conv = ask('> ', conv)
+        if statement.strip() == '':
+            break
+        rows.append(statement)
+
+    # Rows that do not fit into the fleet anymore are not used
+    remaining = total_trucks - truck_nr + 1
+    if len(rows) > remaining:
+        conv = say('Only {0} more vehicle(s) fit in this fleet, so the last {1} row(s) will be ignored.'
+                   .format(remaining, len(rows) - remaining), conv)
+        rows = rows[:remaining]
+
+    trucks = []
+    for row_nr, row in enumerate(rows, start=truck_nr):
+        cells = parse_batch_row(row)
+
+        # With too many values, try to merge the cells split at decimal commas or thousands separators back together;
+        # if that is not possible (or the user rejects all readings), the whole row needs to be entered again
+        while len(cells) > len(TRUCK_FIELDS):
+            candidates = merge_batch_cells(cells) if '\t' not in row else []
+            if len(candidates) > 1:
+                candidates, conv = choose_batch_cells(row_nr, candidates, conv)
+            if len(candidates) == 1:
+                cells = candidates[0]
+            else:
+                row, conv = ask('Vehicle nr. {0} has {1} values instead of {2}; please enter the row again, separated '
+                                'by tabs or with quotes around values that contain commas: '
+                                .format(row_nr, len(cells), len(TRUCK_FIELDS)), conv)
+                cells = parse_batch_row(row)
+        cells.extend([''] * (len(TRUCK_FIELDS) - len(cells)))  # missing values will not pass their criteria
+
+        # Validate every cell, and ask again only for those that do not pass
+        for ii, (_, input_msg, criterion, err_msg, convert) in enumerate(TRUCK_FIELDS):
+            if not criterion(cells[ii]):
+                cells[ii], conv = get_input('Vehicle nr. {0}, {1}'.format(row_nr, err_msg), criterion, err_msg, conv)
+            cells[ii] = convert(cells[ii])
+
+        # Offer spelling corrections only for brands that are not known exactly
+        if cells[0] not in truck_brands:
+            _, input_msg, criterion, err_msg, _ = TRUCK_FIELDS[0]
+            cells[0], conv = correct_brand_name(cells[0], input_msg, criterion, err_msg, truck_brands, conv)
+
+        trucks.append(pd.Series(data=cells, index=columns))
+
+    return trucks, conv
+
+
+def get_trucks(truck_nr: int, total_trucks: int, truck_brands: List, conv: List) -> Tuple[List[pd.Series], List]:
+    """
+    Collects the next truck in the fleet, or several of them if the user pastes comma- or tab-separated rows at the
+    brand prompt.
+
+    Args:
+    :param truck_nr: number of the next truck in the fleet
+    :param total_trucks: total number of trucks in the fleet
+    :param truck_brands: list of unique truck brands
+    :param conv: ongoing conversation list
+
+    Returns:
+    :return: list of pandas Series with truck information, ongoing conversation list
+    """
+    conv = say('\nPlease provide details for vehicle nr. {0}.'.format(truck_nr), conv)
+
+    # Ask for the brand; pasted rows are recognized before the brand criterion is checked
+    _, input_msg, criterion, err_msg, _ = TRUCK_FIELDS[0]
+    statement, conv = ask(input_msg, conv)
+    if is_batch_row(statement):
+        return get_batch_trucks(statement, truck_nr, total_trucks, truck_brands, conv)
+
+    # Otherwise proceed with a single truck in the standard way
+    if not criterion(statement):
+        statement, conv = get_input(err_msg, criterion, err_msg, conv)
+    brand, conv = correct_brand_name(statement, input_msg, criterion, err_msg, truck_brands, conv)
+    truck, conv = get_single_truck(truck_nr, truck_brands, conv, brand=brand)
+
+    return [truck], conv
+
+
 def check_fleet(fleet: pd.DataFrame, truck_brands: List, conv: List) -> Tuple[pd.DataFrame, List]:
     """
     Takes the collected fleet information and asks a user to verify it. If there is something wrong, it collects again
@@ -435,8 +675,7 @@ def get_fleet(truck_brands: List, conv: List) -> Tuple[pd.DataFrame, List]:
     """
 
     # Initialize the fleet table
-    fleet = pd.DataFrame(data=None,
-                         columns=['Brand', 'Model', 'Engine (cc)', 'Axle number', 'Weight (T)', 'Max load (T)'])
+    fleet = pd.DataFrame(data=None, columns=[field[0] for field in TRUCK_FIELDS])
 
     # Get the number of trucks in the fleet
     total_trucks, conv = get_input('How many vehicles are there in this fleet? ',
@@ -447,10 +686,18 @@ def get_fleet(truck_brands: List, conv: List) -> Tuple[pd.DataFrame, List]:
 
     # Collect the fleet data
     conv = say('\nWe will now collect your fleet information.', conv)
+    if total_trucks > 1:
+        conv = say('You can also paste several vehicles at the "Brand:" prompt, one per line, as comma- or '
+                   'tab-separated values in the order: {0}. Finish with an empty line. Values with a decimal comma '
+                   'or a thousands separator (e.g. "8,5" or "40,000 lb") are best pasted tab-separated, or quoted.'
+                   .format(', '.join(field[0] for field in TRUCK_FIELDS)), conv)
     time.sleep(0.5)
-    for truck_nr in range(1, total_trucks+1):
-        truck, conv = get_single_truck(truck_nr, truck_brands, conv)  # get the properties of this truck
-        fleet = fleet.append(truck, ignore_index=True)  # write it into the fleet table
+    truck_nr = 1
+    while truck_nr <= total_trucks:
+        trucks, conv = get_trucks(truck_nr, total_trucks, truck_brands, conv)  # get the properties of these trucks
+        for truck in trucks:
+            fleet = fleet.append(truck, ignore_index=True)  # write it into the fleet table
+        truck_nr += len(trucks)
 
     # Set the fleet index to start from 1, so that it's easier for customers to query it
     fleet.index += 1
@@ -466,7 +713,8 @@ def get_fleet(truck_brands: List, conv: List) -> Tuple[pd.DataFrame, List]:
 #                                                   MAIN function
 # ----------------------------------------------------------------------------------------------------------------------
 
-def main(data_folder: str, brands_file: str, fleet_name_suf: str, conv_name_suf: str, date_now: str):
+def main(data_folder: str, brands_file: str, fleet_name_suf: str, conv_name_suf: str, date_now: str,
+         session_id: str = None):
     """
     Perform the conversation with the customer, collect the data, write it into a csv file, and save the entire
     dialogue in a txt file.
@@ -477,6 +725,7 @@ def main(data_folder: str, brands_file: str, fleet_name_suf: str, conv_name_suf:
     :param fleet_name_suf: suffix for creating the fleet file name
     :param conv_name_suf: suffix for creating the conversation file name
     :param date_now: today's date
+    :param session_id: ID of the current session, e.g. from `generate_random_user()`; generated if not given
     """
     global fleet_path, conv_path
 
@@ -497,7 +746,7 @@ def main(data_folder: str, brands_file: str, fleet_name_suf: str, conv_name_suf:
     time.sleep(0.5)
 
     # Get basic information and construct the base of the file name used for saving the data
-    fleet_path, conv_path, conv = get_basic_info(data_folder, fleet_name_suf, conv_name_suf, date_now, conv)
+    fleet_path, conv_path, conv = get_basic_info(data_folder, fleet_name_suf, conv_name_suf, date_now, conv, session_id)
 
     # Obtain the complete fleet information
     fleet, conv = get_fleet(brands, conv)
@@ -523,6 +772,6 @@ if __name__ == "__main__":
     conv_suffix = 'conversation.txt'  # suffix for creating the conversation file name
 
     # Initialize random user, for bookkeeping purposes
-    fleet_path, conv_path, today = generate_random_user(fleet_suffix, conv_suffix)
+    fleet_path, conv_path, today, session = generate_random_user(fleet_suffix, conv_suffix)
 
-    main(data_path, brands_path, fleet_suffix, conv_suffix, today)
+    main(data_path, brands_path, fleet_suffix, conv_suffix, today, session)
@@ -0,0 +1,52 @@
+"""
+Definitions of the truck properties collected by the bot, kept apart from the interactive conversation (and its
+imports) so that they can be reused, e.g. when analyzing the saved conversations.
+"""
+
+import re
+from quantities import parse_quantity, plausible_quantity
+
+
+# Properties collected for every truck, in the order in which they are asked for: fleet table column, prompt message,
+# criterion that the user input needs to pass, error message if it does not, and conversion of the accepted input to
+# the value stored in the fleet table. Engine size, weight, and load can be given with units (e.g. "12.8 L", "18 t",
+# "40,000 lb"), are checked against realistic limits, and are converted to cubic centimeters and metric tonnes.
+# TODO: ask a domain expert what would be a more general model name pattern
+TRUCK_FIELDS = [
+    ('Brand', 'Brand: ', str.isalpha,
+     'Brand name should not contain only letters; please try again: ',
+     str),
+    ('Model', 'Model: ', lambda x: re.match(r'[a-zA-Z]{2} \d+', x),  # assume this pattern due to lack of expertise
+     'Model name should have the pattern of two letters followed by space followed by a series of numbers,'
+     'e.g. "SC 3200"; please try again: ',
+     str),
+    ('Engine (cc)', 'Engine size (in cubic centimeters): ', lambda x: plausible_quantity(x, 'Engine (cc)'),
+     'Engine size should be a number between 50 and 200000 cc, optionally followed by a unit, e.g. "12800", '
+     '"12800 cc" or "12.8 L"; please try again: ',
+     lambda x: int(round(parse_quantity(x, 'cc')))),
+    ('Axle number', 'Number of truck axles: ', lambda x: re.match(r'^\d{1,2}$', x),
+     'Please enter only a single- or double-digit whole number: ',
+     str),
+    ('Weight (T)', 'Truck weight in metric tonnes: ', lambda x: plausible_quantity(x, 'Weight (T)'),
+     'Truck weight should be a number between 0.1 and 1000 t, optionally followed by a unit, e.g. "3.5", "3,5 t" or '
+     '"3500 kg"; please try again: ',
+     lambda x: round(parse_quantity(x, 't'), 3)),
+    ('Max load (T)', 'Truck maximal load in metric tonnes: ', lambda x: plausible_quantity(x, 'Max load (T)'),
+     'Maximal load should be a number between 0.1 and 1000 t, optionally followed by a unit, e.g. "18", "18 t" or '
+     '"40,000 lb"; please try again: ',
+     lambda x: round(parse_quantity(x, 't'), 3)),
+]
+
+
+def is_batch_row(statement: str) -> bool:
+    """
+    Shorthand function for determining whether the user pasted a row of comma- or tab-separated truck properties
+    instead of typing in a single brand name.
+
+    Args:
+    :param statement: user input
+
+    Returns:
+    :return: boolean determining whether the user input is a batch row
+    """
+    return ',' in statement or '\t' in statement